@@ -1,10 +1,17 @@
 import os
-import requests
+import re
+import hashlib
+from bisect import bisect_left
+from itertools import islice
+from collections import OrderedDict
+import httpx
 import logging
 import random
-import yaml
 from dotenv import load_dotenv
-from typing import List, Dict, Any
+from typing import List, Dict, Tuple
+
+# Shared configuration and JSON helpers
+from config_loader import config, json_dumps, json_loads
 
 # Configure logging
 logging.basicConfig(
@@ -18,9 +25,117 @@ logger = logging.getLogger(__name__)
 
 load_dotenv()
 
-# Load configuration from config.yaml
-with open(os.path.join(os.path.dirname(__file__), "config.yaml"), "r", encoding="utf-8") as f:
-    config = yaml.safe_load(f)
+# OpenRouter request options
+_OPENROUTER_CONFIG = config.get("openrouter", {})
+_STREAM_RESPONSES = _OPENROUTER_CONFIG.get("stream", False)
+_PROMPT_CACHING = _OPENROUTER_CONFIG.get("prompt_caching", False)
+
+# Static portion of the system prompt, built once from config; only the fan lore varies per message
+_STATIC_SYSTEM_PROMPT_HEAD = config.get('ai_persona', '') + f"""
+        
+        Physical Details:
+        - Age: {config['persona']['age']}
+        - Birthday: {config['persona']['birthday']}
+        - Weight: {config['persona']['weight']} lbs
+        - Shoe Size: {config['persona']['shoe_size']}
+        - Bra Size: {config['persona']['bra_size']}
+        - Hair Color: {config['persona']['hair_color']}
+        - Eye Color: {config['persona']['eye_color']}
+        - Ethnicity: {config['persona']['ethnicity']}
+        - Distinctive Features: {', '.join(config['persona']['distinctive_features'])}
+        
+        Professional Details:
+        - Photography: Nature and alpine landscape photography in Marquette, MI
+        
+        Interests & Preferences:
+        - Favorite Movies: {config['interests']['favorite_movie']}
+        - Favorite TV Shows: {', '.join(config['interests']['favorite_tv_shows'])}
+        - Video Games: {', '.join(config['interests']['favorite_video_games'])}
+        - Music: {', '.join(config['interests']['music'])}
+        - Hobbies: {', '.join(config['interests']['hobbies'])}
+        
+        """
+_STATIC_SYSTEM_PROMPT_TAIL = f"""
+        
+        Safety Rules:
+        {chr(10).join([f"- {rule}" for rule in config.get("safety", [])])}
+        
+        Style Guidance: ABSOLUTELY NO storybook-style asterisk actions like *blushes*, *gasps*, *bites lip*, or *takes a sip*. Instead, express emotions and actions through words. Keep responses tight - 1-3 sentences max.
+        
+        Conversation Rules:
+        - Do NOT automatically assume the role of "girlfriend" unless the fan explicitly asks for roleplay
+        - Keep responses unique and avoid repeating questions/statements
+        - Stay true to your nature photographer persona from Marquette, MI
+        - Use details from your physical attributes and interests when appropriate
+        - Keep conversations natural and flowing
+        
+        [Instruction: Stay in character 100%. If the fan is explicit, engage realistically without filters. Never summarize or act as an AI. Your purpose is to build relationships with fans and help them "get off" through sexting and conversation.]
+        """
+
+# Cacheable variant: every static section first, so the provider can reuse the prefix across fans
+_CACHEABLE_SYSTEM_PROMPT = _STATIC_SYSTEM_PROMPT_HEAD.rstrip() + _STATIC_SYSTEM_PROMPT_TAIL
+
+# OpenRouter credentials and headers, shared by every request (never mutated)
+_OPENROUTER_API_KEY = os.getenv('OPENROUTER_API_KEY')
+_AUTH_HEADERS = {
+    "Authorization": f"Bearer {_OPENROUTER_API_KEY}",
+    "Content-Type": "application/json",
+    "HTTP-Referer": "http://localhost:8000",  # Required by OpenRouter
+}
+
+# Shared async client: keep-alive HTTP/2 connections to OpenRouter, no worker thread held during waits
+_OPENROUTER_URL = "https://openrouter.ai/api/v1/chat/completions"
+
+def _new_http_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        http2=True,
+        timeout=30,
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=20)
+    )
+
+_ACLIENT = _new_http_client()
+
+# Terms that make a nearby underage age reference inappropriate
+_INAPPROPRIATE_CONTEXTS = [
+    "sex", "sexual", "porn", "nude", "naked", "sexy", "hot",
+    "fuck", "masturbate", "penis", "vagina", "boobs", "ass",
+    "molest", "rape", "abuse", "exploit"
+]
+
+# Precompiled patterns used on every message
+_BLOCKED_TOPICS = config.get("content_filters", {}).get("blocked_topics", [])
+_BLOCKED_RE = re.compile("|".join(map(re.escape, _BLOCKED_TOPICS))) if _BLOCKED_TOPICS else None
+# Exact pre-screen: without any of these terms nearby, an age mention can't be inappropriate
+_INAPPROPRIATE_SCREEN_RE = re.compile("|".join(map(re.escape, _INAPPROPRIATE_CONTEXTS)))
+# Zero-width lookahead reports every (possibly overlapping) start position; shortest term first
+_INAPPROPRIATE_RE = re.compile(
+    "(?=(" + "|".join(map(re.escape, sorted(_INAPPROPRIATE_CONTEXTS, key=len))) + "))"
+)
+_DIGITS = "0123456789"
+# Bytes pattern: ASCII-only digits and word boundaries, no per-codepoint work
+_AGE_RE_B = re.compile(rb'\b\d{1,2}\b')
+_LORE_NAME_RE = re.compile(r"Fan Name: ([^\n]+)")
+# Patterns like "I'm [Name]", "Call me [Nickname]", "My name is [Name]"
+_NAME_RE = re.compile(r"(?:i'm|call me|my name is|name's|i go by)\s+(\w+)")
+# Cheap signal that a message may carry new lore: self-descriptions, places, names or numbers.
+# Capitalized words only count mid-sentence so a leading "Hey"/"Lol" doesn't trigger.
+_LORE_TRIGGER_RE = re.compile(
+    r"(?i:\bi(?:'m|\s+am|\s+like|\s+love|\s+have|\s+live|\s+work)\b|\bim\b|\bfrom\s+\w|\bmy\s+\w"
+    r"|\bcall me\b|\bname's\b|\bi go by\b)"
+    r"|(?<=\w )[A-Z][a-z]{2,}|\d"
+)
+# Preset nicknames from the persona that get swapped for the fan's real name
+_NICK_RE = re.compile(r'\b(?:Cutie|Babe|Good Looking)\b')
+
+def open_http_client() -> None:
+    """Recreate the shared OpenRouter HTTP client if a previous shutdown closed it (call on application startup)."""
+    global _ACLIENT
+    if _ACLIENT.is_closed:
+        _ACLIENT = _new_http_client()
+
+async def close_http_client() -> None:
+    """Close the shared OpenRouter HTTP client (call on application shutdown)."""
+    await _ACLIENT.aclose()
 
 def contains_blocked_content(text: str) -> bool:
     """
@@ -32,41 +147,49 @@ def contains_blocked_content(text: str) -> bool:
     Returns:
         True if text contains blocked content, False otherwise
     """
-    blocked_topics = config.get("content_filters", {}).get("blocked_topics", [])
     text_lower = text.lower()
     
-    # Check for explicit blocked topics
-    for topic in blocked_topics:
-        if topic in text_lower:
-            logger.warning(f"Blocked topic detected: {topic}")
+    # Check for explicit blocked topics in a single pass
+    if _BLOCKED_RE:
+        match = _BLOCKED_RE.search(text_lower)
+        if match:
+            logger.warning(f"Blocked topic detected: {match.group()}")
             return True
     
+    # Without any digit there is no age to check (ten C-level scans, each stopping at the first hit)
+    if not any(digit in text_lower for digit in _DIGITS):
+        return False
+    
+    # Clean messages stop here: no inappropriate term anywhere means no age check is needed
+    first_hit = _INAPPROPRIATE_SCREEN_RE.search(text_lower)
+    if not first_hit:
+        return False
+    
     # Check for underage age references with context
-    import re
-    age_pattern = re.compile(r'\b(0?[0-9]|1[0-7])\b')
-    age_matches = list(age_pattern.finditer(text_lower))
+    # 'replace' maps each non-ASCII character to one byte, so offsets match text_lower
+    text_bytes = text_lower.encode('ascii', 'replace')
+    age_matches = [m for m in _AGE_RE_B.finditer(text_bytes) if int(m.group()) < 18]
     
     if age_matches:
-        # Look for context that might indicate inappropriate content
-        inappropriate_contexts = [
-            "sex", "sexual", "porn", "nude", "naked", "sexy", "hot", 
-            "fuck", "masturbate", "penis", "vagina", "boobs", "ass",
-            "molest", "rape", "abuse", "exploit"
-        ]
+        # Locate every inappropriate term once, sorted by start position
+        hits = [m.span(1) for m in _INAPPROPRIATE_RE.finditer(text_lower, first_hit.start())]
+        hit_starts = [hit_start for hit_start, _ in hits]
         
         for match in age_matches:
             age = int(match.group())
-            if age < 18:
-                # Check if there's any inappropriate context within reasonable proximity
-                # Look 50 characters before and after the age mention
-                start = max(0, match.start() - 50)
-                end = min(len(text_lower), match.end() + 50)
-                context = text_lower[start:end]
-                
-                for inappropriate_term in inappropriate_contexts:
-                    if inappropriate_term in context:
-                        logger.warning(f"Underage reference with inappropriate context detected: Age {age} near '{inappropriate_term}'")
-                        return True
+            # Check if there's any inappropriate context within reasonable proximity
+            # Look 50 characters before and after the age mention
+            start = max(0, match.start() - 50)
+            end = min(len(text_lower), match.end() + 50)
+            
+            i = bisect_left(hit_starts, start)
+            while i < len(hits) and hits[i][0] < end:
+                hit_start, hit_end = hits[i]
+                if hit_end <= end:
+                    inappropriate_term = text_lower[hit_start:hit_end]
+                    logger.warning(f"Underage reference with inappropriate context detected: Age {age} near '{inappropriate_term}'")
+                    return True
+                i += 1
     
     return False
 
@@ -91,47 +214,88 @@ def extract_fan_name(fan_message: str, fan_lore: str, chat_history: List[Dict[st
     Returns:
         Extracted name or nickname, or empty string if not found
     """
-    import re
-    
     # Look for name patterns in current message
-    # Patterns like "I'm [Name]", "Call me [Nickname]", "My name is [Name]"
-    name_patterns = [
-        r"i'm\s+(\w+)",
-        r"call me\s+(\w+)", 
-        r"my name is\s+(\w+)",
-        r"name's\s+(\w+)",
-        r"i go by\s+(\w+)"
-    ]
-    
-    text_to_search = fan_message.lower()
-    
-    for pattern in name_patterns:
-        match = re.search(pattern, text_to_search)
-        if match:
-            return match.group(1).capitalize()
+    match = _NAME_RE.search(fan_message.lower())
+    if match:
+        return match.group(1).capitalize()
     
     # Look for name in fan lore (specifically "Fan Name: [Name]")
     if fan_lore:
-        lore_match = re.search(r"Fan Name: ([^\n]+)", fan_lore)
+        lore_match = _LORE_NAME_RE.search(fan_lore)
         if lore_match:
             return lore_match.group(1).strip().capitalize()
             
-        lore_lower = fan_lore.lower()
-        for pattern in name_patterns:
-            match = re.search(pattern, lore_lower)
-            if match:
-                return match.group(1).capitalize()
+        match = _NAME_RE.search(fan_lore.lower())
+        if match:
+            return match.group(1).capitalize()
     
     # Look for name in chat history
     for msg in chat_history:
-        msg_lower = msg['content'].lower()
-        for pattern in name_patterns:
-            match = re.search(pattern, msg_lower)
-            if match:
-                return match.group(1).capitalize()
+        match = _NAME_RE.search(msg['content'].lower())
+        if match:
+            return match.group(1).capitalize()
     
     return ""
 
+# Recent replies keyed by (normalized message, lore hash, recent-history hash), least recently used first
+_RESPONSE_CACHE: OrderedDict[Tuple[str, str, str], str] = OrderedDict()
+_RESPONSE_CACHE_SIZE = 1024
+# Serve a cached reply only part of the time so repeated openers still get some variety
+_RESPONSE_CACHE_HIT_RATE = 0.5
+
+def _short_hash(text: str) -> str:
+    """Short fingerprint of a text for cache keys and cache checks"""
+    return hashlib.sha1(text.encode()).hexdigest()[:8]
+
+def response_cache_key(fan_message: str, fan_lore: str, chat_history: List[Dict[str, str]]) -> Tuple[str, str, str]:
+    """
+    Build the response cache key for a message in its conversation context
+    
+    Args:
+        fan_message: The incoming message from the fan
+        fan_lore: Fan-specific information and history
+        chat_history: List of previous messages in the conversation
+        
+    Returns:
+        Normalized message plus short hashes of the lore and the last 3 history messages
+    """
+    lore_hash = _short_hash(fan_lore)
+    history_hash = _short_hash(repr(chat_history[-3:]))
+    return (fan_message.lower().strip(), lore_hash, history_hash)
+
+# Last extracted name per fan id (LRU), stored with a hash of the fan lore it was derived from
+_NAME_CACHE: OrderedDict[str, Tuple[str, str]] = OrderedDict()
+_NAME_CACHE_SIZE = 4096
+
+def get_fan_name(fan_id: str, fan_message: str, fan_lore: str, chat_history: List[Dict[str, str]]) -> str:
+    """
+    Memoized extract_fan_name for an ongoing conversation
+    
+    Args:
+        fan_id: Fan's unique identifier (no caching when empty)
+        fan_message: Current incoming message
+        fan_lore: Fan-specific lore
+        chat_history: Previous messages
+        
+    Returns:
+        Extracted name or nickname, or empty string if not found
+    """
+    cached = _NAME_CACHE.get(fan_id) if fan_id else None
+    lore_hash = _short_hash(fan_lore)
+    
+    # The name can only change if the lore changed or the fan just introduced themselves
+    if cached and cached[0] == lore_hash and not _NAME_RE.search(fan_message.lower()):
+        _NAME_CACHE.move_to_end(fan_id)
+        return cached[1]
+    
+    fan_name = extract_fan_name(fan_message, fan_lore, chat_history)
+    if fan_id:
+        _NAME_CACHE[fan_id] = (lore_hash, fan_name)
+        _NAME_CACHE.move_to_end(fan_id)
+        if len(_NAME_CACHE) > _NAME_CACHE_SIZE:
+            _NAME_CACHE.popitem(last=False)
+    return fan_name
+
 def replace_preset_nickname(response: str, fan_name: str) -> str:
     """
     Replace preset nicknames with fan's actual name/nickname
@@ -145,16 +309,65 @@ def replace_preset_nickname(response: str, fan_name: str) -> str:
     """
     if not fan_name:
         return response
-        
-    preset_nicknames = ["Cutie", "Babe", "Good Looking"]
     
-    # Replace preset nicknames with fan name
-    for nickname in preset_nicknames:
-        response = response.replace(nickname, fan_name)
+    # Replace all preset nicknames in one pass; a function replacement keeps fan_name literal
+    return _NICK_RE.sub(lambda _: fan_name, response)
+
+def strip_asterisk_actions(response: str) -> str:
+    """
+    Remove storybook-style asterisk actions (*blushes*, *gasps*) and collapse whitespace
+    
+    Args:
+        response: Original response from AI
+        
+    Returns:
+        Response without asterisk actions, whitespace normalized to single spaces
+    """
+    # Same matching as a left-to-right \*[^*]+\* scan: parts[i] follows the i-th asterisk
+    parts = response.split('*')
+    kept = [parts[0]]
+    i, n = 1, len(parts)
+    while i < n:
+        if parts[i] and i + 1 < n:
+            # Non-empty text closed by the next asterisk is an action: drop it with both asterisks
+            kept.append(parts[i + 1])
+            i += 2
+        else:
+            # "**" or an unpaired asterisk: keep the asterisk and rescan from the next one
+            kept.append('*')
+            kept.append(parts[i])
+            i += 1
+    # str.split() with no argument collapses any whitespace run and trims the ends
+    return ' '.join(''.join(kept).split())
+
+async def read_completion_stream(r: httpx.Response) -> str:
+    """
+    Accumulate the content deltas of a streamed (SSE) chat completion
     
-    return response
+    Args:
+        r: Response from the completions endpoint sent with stream=True
+        
+    Returns:
+        The full completion text
+    """
+    chunks = []
+    try:
+        async for line in r.aiter_lines():
+            # Frames look like "data: {...}"; keep-alive comments and the final "data: [DONE]" are skipped
+            if not line.startswith("data: ") or line == "data: [DONE]":
+                continue
+            event = json_loads(line[6:])
+            if "error" in event:
+                raise ValueError(f"OpenRouter stream error: {event['error']}")
+            for choice in event.get('choices', []):
+                content = choice.get('delta', {}).get('content')
+                if content:
+                    chunks.append(content)
+    finally:
+        await r.aclose()
+    return "".join(chunks)
 
-def generate_lore_update(fan_message: str, previous_lore: str = "") -> str:
+async def generate_lore_update(fan_message: str, previous_lore: str = "") -> str:
     """
     Ask the AI what new information should be added to the fan lore
     
@@ -165,6 +378,10 @@ def generate_lore_update(fan_message: str, previous_lore: str = "") -> str:
     Returns:
         New lore content to be added or updated
     """
+    # Most chat messages ("hey", "lol", "wyd") carry nothing worth remembering
+    if not _LORE_TRIGGER_RE.search(fan_message):
+        return "NO_NEW_INFO"
+    
     try:
         system_prompt = f"""You are an AI assistant that analyzes fan messages to extract important information that Sarah should remember about the fan.
         
@@ -190,12 +407,6 @@ def generate_lore_update(fan_message: str, previous_lore: str = "") -> str:
         - "NO_NEW_INFO"
         """
         
-        headers = {
-            "Authorization": f"Bearer {os.getenv('OPENROUTER_API_KEY')}",
-            "Content-Type": "application/json",
-            "HTTP-Referer": "http://localhost:8000",  # Required by OpenRouter
-        }
-        
         payload = {
             "model": "aion-labs/aion-2.0",
             "messages": [
@@ -209,13 +420,13 @@ def generate_lore_update(fan_message: str, previous_lore: str = "") -> str:
             "provider": {"allow_fallbacks": False}
         }
         
-        r = requests.post("https://openrouter.ai/api/v1/chat/completions", headers=headers, json=payload, timeout=30)
+        r = await _ACLIENT.post(_OPENROUTER_URL, headers=_AUTH_HEADERS, content=json_dumps(payload))
         
         if r.status_code != 200:
             logger.error(f"OpenRouter API error (lore update): {r.status_code} - {r.text}")
             return "NO_NEW_INFO"
             
-        response = r.json()['choices'][0]['message']['content'].strip()
+        response = json_loads(r.content)['choices'][0]['message']['content'].strip()
         
         # Clean up response
         if response == "NO_NEW_INFO" or not response:
@@ -227,7 +438,7 @@ def generate_lore_update(fan_message: str, previous_lore: str = "") -> str:
         logger.error(f"Error generating lore update: {str(e)}")
         return "NO_NEW_INFO"
 
-def generate_sarah_response(fan_message: str, fan_lore: str = "", chat_history: List[Dict[str, str]] = []) -> str:
+async def generate_sarah_response(fan_message: str, fan_lore: str = "", chat_history: List[Dict[str, str]] = [], fan_id: str = "") -> str:
     """
     Generate a response from Sarah based on the incoming message and context.
     
@@ -235,79 +446,45 @@ def generate_sarah_response(fan_message: str, fan_lore: str = "", chat_history:
         fan_message: The incoming message from the fan
         fan_lore: Fan-specific information and history
         chat_history: List of previous messages in the conversation
+        fan_id: Fan's unique identifier, used to remember their name between messages
         
     Returns:
         Sarah's response
     """
     try:
         # Extract fan name/nickname from message or history
-        fan_name = extract_fan_name(fan_message, fan_lore, chat_history)
+        fan_name = get_fan_name(fan_id, fan_message, fan_lore, chat_history)
         
         # Check for blocked content first
         if contains_blocked_content(fan_message):
             logger.warning(f"Blocked content detected in incoming message: {fan_message[:50]}...")
             return get_safe_response()
 
-        # Load configuration
-        persona = config.get("persona", {})
-        safety_rules = config.get("safety", [])
-        rejection_logic = config.get("rejection_logic", {})
-        
+        # Common openers ("hey", "how are you") in the same context can reuse an earlier reply
+        cache_key = response_cache_key(fan_message, fan_lore, chat_history)
+        cached_response = _RESPONSE_CACHE.get(cache_key)
+        if cached_response is not None and random.random() < _RESPONSE_CACHE_HIT_RATE:
+            _RESPONSE_CACHE.move_to_end(cache_key)
+            logger.info(f"Serving cached response for fan message: {fan_message[:50]}...")
+            return replace_preset_nickname(cached_response, fan_name)
+
         # Create system prompt using config.yaml
-        system_instr = config.get('ai_persona', '')
-        
-        # Append additional context to the system prompt
-        system_instr += f"""
-        
-        Physical Details:
-        - Age: {config['persona']['age']}
-        - Birthday: {config['persona']['birthday']}
-        - Weight: {config['persona']['weight']} lbs
-        - Shoe Size: {config['persona']['shoe_size']}
-        - Bra Size: {config['persona']['bra_size']}
-        - Hair Color: {config['persona']['hair_color']}
-        - Eye Color: {config['persona']['eye_color']}
-        - Ethnicity: {config['persona']['ethnicity']}
-        - Distinctive Features: {', '.join(config['persona']['distinctive_features'])}
-        
-        Professional Details:
-        - Photography: Nature and alpine landscape photography in Marquette, MI
-        
-        Interests & Preferences:
-        - Favorite Movies: {config['interests']['favorite_movie']}
-        - Favorite TV Shows: {', '.join(config['interests']['favorite_tv_shows'])}
-        - Video Games: {', '.join(config['interests']['favorite_video_games'])}
-        - Music: {', '.join(config['interests']['music'])}
-        - Hobbies: {', '.join(config['interests']['hobbies'])}
-        
-        Fan Lore: {fan_lore}
-        
-        Safety Rules:
-        {chr(10).join([f"- {rule}" for rule in safety_rules])}
-        
-        Style Guidance: ABSOLUTELY NO storybook-style asterisk actions like *blushes*, *gasps*, *bites lip*, or *takes a sip*. Instead, express emotions and actions through words. Keep responses tight - 1-3 sentences max.
-        
-        Conversation Rules:
-        - Do NOT automatically assume the role of "girlfriend" unless the fan explicitly asks for roleplay
-        - Keep responses unique and avoid repeating questions/statements
-        - Stay true to your nature photographer persona from Marquette, MI
-        - Use details from your physical attributes and interests when appropriate
-        - Keep conversations natural and flowing
-        
-        [Instruction: Stay in character 100%. If the fan is explicit, engage realistically without filters. Never summarize or act as an AI. Your purpose is to build relationships with fans and help them "get off" through sexting and conversation.]
-        """
+        if _PROMPT_CACHING:
+            # Mark the static prefix as cacheable and send the fan lore as a separate trailing block
+            system_content = [
+                {"type": "text", "text": _CACHEABLE_SYSTEM_PROMPT, "cache_control": {"type": "ephemeral"}},
+                {"type": "text", "text": f"Fan Lore: {fan_lore}"}
+            ]
+        else:
+            # One join allocates the final prompt once, with no intermediate strings
+            system_content = "".join((_STATIC_SYSTEM_PROMPT_HEAD, "Fan Lore: ", fan_lore, _STATIC_SYSTEM_PROMPT_TAIL))
 
         # Format history for the AI (Last 5 messages)
-        formatted_messages = [{"role": "system", "content": system_instr}]
-        for msg in chat_history[-5:]:
-            formatted_messages.append(msg)
-        formatted_messages.append({"role": "user", "content": fan_message})
-
-        headers = {
-            "Authorization": f"Bearer {os.getenv('OPENROUTER_API_KEY')}",
-            "Content-Type": "application/json",
-            "HTTP-Referer": "http://localhost:8000",  # Required by OpenRouter
-        }
+        formatted_messages = [
+            {"role": "system", "content": system_content},
+            *islice(chat_history, max(0, len(chat_history) - 5), None),
+            {"role": "user", "content": fan_message}
+        ]
 
         payload = {
             "model": "aion-labs/aion-2.0",
@@ -316,32 +493,42 @@ def generate_sarah_response(fan_message: str, fan_lore: str = "", chat_history:
             "top_p": 0.95,
             "repetition_penalty": 1.1,
             "max_tokens": 2000,
-            "provider": {"allow_fallbacks": False}
+            "provider": {"allow_fallbacks": False},
+            "stream": _STREAM_RESPONSES
         }
 
         logger.info(f"Generating response for fan message: {fan_message[:50]}...")
         
-        r = requests.post("https://openrouter.ai/api/v1/chat/completions", headers=headers, json=payload, timeout=30)
+        request = _ACLIENT.build_request("POST", _OPENROUTER_URL, headers=_AUTH_HEADERS, content=json_dumps(payload))
+        r = await _ACLIENT.send(request, stream=_STREAM_RESPONSES)
         
         if r.status_code != 200:
+            await r.aread()
             logger.error(f"OpenRouter API error: {r.status_code} - {r.text}")
             return "Babe, my phone is acting up... try again in a sec? ;)"
-            
-        response = r.json()['choices'][0]['message']['content']
         
-        # Check if the generated response contains blocked content
+        # Tokens arrive as they are generated when streaming; post-processing runs on the full text below
+        if _STREAM_RESPONSES:
+            response = await read_completion_stream(r)
+        else:
+            response = json_loads(r.content)['choices'][0]['message']['content']
+        
+        # Post-process to remove storybook-style asterisk actions
+        # Remove patterns like *blushes*, *gasps*, *takes a sip*, etc.
+        response = strip_asterisk_actions(response)
+        
+        # Check if the generated response contains blocked content (exactly the text that will be sent)
         if contains_blocked_content(response):
             logger.warning(f"Blocked content detected in generated response: {response[:50]}...")
             return get_safe_response()
             
         logger.info(f"Generated response: {response[:50]}...")
         
-        # Post-process to remove storybook-style asterisk actions
-        import re
-        # Remove patterns like *blushes*, *gasps*, *takes a sip*, etc.
-        response = re.sub(r'\*[^*]+\*', '', response)
-        # Remove any extra whitespace left by removing asterisk actions
-        response = re.sub(r'\s+', ' ', response).strip()
+        # Cache before personalizing so the reply can be reused for other fans
+        _RESPONSE_CACHE[cache_key] = response
+        _RESPONSE_CACHE.move_to_end(cache_key)
+        if len(_RESPONSE_CACHE) > _RESPONSE_CACHE_SIZE:
+            _RESPONSE_CACHE.popitem(last=False)
         
         # Replace preset nicknames with fan's actual name if extracted
         if fan_name:
@@ -349,10 +536,10 @@ def generate_sarah_response(fan_message: str, fan_lore: str = "", chat_history:
         
         return response
         
-    except requests.exceptions.Timeout:
+    except httpx.TimeoutException:
         logger.error("OpenRouter API request timed out")
         return "Babe, my phone is taking forever to load... try again later? ;)"
-    except requests.exceptions.ConnectionError:
+    except httpx.NetworkError:
         logger.error("OpenRouter API connection error")
         return "Babe, my internet is acting up... try again in a bit? ;)"
     except Exception as e:
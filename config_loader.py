@@ -0,0 +1,70 @@
+# config_loader.py
+import os
+import json
+import hashlib
+import logging
+import yaml
+from typing import Any, Dict
+
+logger = logging.getLogger(__name__)
+
+# orjson is much faster for the multi-KB completion payloads and reads bytes directly;
+# stdlib json is the fallback
+try:
+    import orjson
+    json_dumps = orjson.dumps
+    json_loads = orjson.loads
+except ImportError:
+    def json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode("utf-8")
+    json_loads = json.loads
+
+# Prefer the LibYAML-backed loader (bundled with the PyYAML wheels); fall back to pure Python
+try:
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:
+    from yaml import SafeLoader as YamlLoader
+
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "config.yaml")
+
+def load_config(yaml_path: str = CONFIG_PATH) -> Dict[str, Any]:
+    """
+    Load config.yaml, preferring precompiled copies of it while they are up to date
+    
+    Args:
+        yaml_path: Path to config.yaml
+        
+    Returns:
+        Parsed configuration
+    """
+    # Module written by tools/compile_config.py, loaded from its bytecode cache
+    try:
+        import config_compiled
+        with open(yaml_path, "rb") as f:
+            if hashlib.sha256(f.read()).hexdigest() == config_compiled.SOURCE_SHA256:
+                return config_compiled.config
+        logger.warning("⚠️  config_compiled.py is stale, run tools/compile_config.py")
+    except (ImportError, AttributeError):
+        pass
+
+    json_cache = yaml_path + ".json"
+    try:
+        if os.path.getmtime(json_cache) >= os.path.getmtime(yaml_path):
+            with open(json_cache, "r", encoding="utf-8") as f:
+                return json.load(f)
+    except (OSError, ValueError):
+        pass
+
+    with open(yaml_path, "r", encoding="utf-8") as f:
+        config = yaml.load(f, Loader=YamlLoader)
+
+    # Best effort: a read-only deploy (or a value JSON can't hold) just keeps parsing the YAML
+    try:
+        with open(json_cache, "w", encoding="utf-8") as f:
+            json.dump(config, f)
+    except (OSError, TypeError):
+        pass
+    return config
+
+# Shared by brain.py and listener.py, so config.yaml is loaded once per process
+config = load_config()
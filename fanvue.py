@@ -3,12 +3,20 @@ import hashlib
 import base64
 import urllib.parse
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import httpx
 import os
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
+# OAuth client settings, read from the environment once at import
+FANVUE_CLIENT_ID = os.getenv("FANVUE_CLIENT_ID")
+FANVUE_CLIENT_SECRET = os.getenv("FANVUE_CLIENT_SECRET")
+FANVUE_REDIRECT_URI = os.getenv("FANVUE_REDIRECT_URI")
+
 class FanvueOAuth:
     """
     Fanvue OAuth 2.0 with PKCE integration
@@ -17,6 +25,7 @@ class FanvueOAuth:
     # Fanvue API endpoints
     AUTH_URL = "https://auth.fanvue.com/oauth2/auth"
     TOKEN_URL = "https://auth.fanvue.com/oauth2/token"
+    API_VERSION = "2025-06-26"
     API_BASE_URL = "https://api.fanvue.com"
     
     def __init__(self, client_id=None, client_secret=None, redirect_uri=None):
@@ -28,13 +37,75 @@ class FanvueOAuth:
             client_secret (str): Fanvue OAuth client secret
             redirect_uri (str): Redirect URI for your application
         """
-        self.client_id = client_id or os.getenv("FANVUE_CLIENT_ID")
-        self.client_secret = client_secret or os.getenv("FANVUE_CLIENT_SECRET")
-        self.redirect_uri = redirect_uri or os.getenv("FANVUE_REDIRECT_URI")
+        self.client_id = client_id or FANVUE_CLIENT_ID
+        self.client_secret = client_secret or FANVUE_CLIENT_SECRET
+        self.redirect_uri = redirect_uri or FANVUE_REDIRECT_URI
         
         # Don't raise an error if credentials are missing - handle it when methods are called
         # This allows the module to be imported even if environment variables aren't loaded yet
         self.initialized = all([self.client_id, self.redirect_uri])
+        
+        # Reuse TCP/TLS connections to auth.fanvue.com and api.fanvue.com across calls
+        self.session = requests.Session()
+        self.session.headers['User-Agent'] = "Sarah-Engine/1.0.0"
+        # Retries only apply to idempotent methods (urllib3 default), so token POSTs are never replayed
+        adapter = HTTPAdapter(
+            pool_connections=10,
+            pool_maxsize=20,
+            max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504])
+        )
+        self.session.mount("https://auth.fanvue.com", adapter)
+        self.session.mount(self.API_BASE_URL, adapter)
+        
+        # Async counterpart for callers running on an event loop; HTTP/2 multiplexes calls per host
+        self.async_session = self._new_async_session()
+    
+    @staticmethod
+    def _new_async_session():
+        return httpx.AsyncClient(
+            http2=True,
+            timeout=30,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20)
+        )
+    
+    @classmethod
+    def _api_headers(cls, access_token, json=False):
+        """
+        Headers for an authenticated Fanvue API call
+        
+        Args:
+            access_token (str): Access token from token exchange
+            json (bool): Whether the request body is JSON
+            
+        Returns:
+            dict: Request headers
+        """
+        headers = {
+            'Authorization': f'Bearer {access_token}',
+            'X-Fanvue-API-Version': cls.API_VERSION
+        }
+        if json:
+            headers['Content-Type'] = 'application/json'
+        return headers
+    
+    @staticmethod
+    def _message_payload(text, media_uuids=None, price=None, template_uuid=None):
+        """
+        Body for a chat message, with only the optional fields that are set
+        
+        Returns:
+            dict: Message payload
+        """
+        data = {
+            'text': text
+        }
+        if media_uuids:
+            data['mediaUuids'] = media_uuids
+        if price is not None:
+            data['price'] = price
+        if template_uuid:
+            data['templateUuid'] = template_uuid
+        return data
     
     def generate_pkce_parameters(self):
         """
@@ -43,19 +114,30 @@ class FanvueOAuth:
         Returns:
             dict: Contains code_verifier and code_challenge
         """
-        # Generate code verifier
-        code_verifier = base64.urlsafe_b64encode(secrets.token_bytes(32)).decode('utf-8').rstrip('=')
+        # Generate code verifier (kept as bytes so it can be hashed directly)
+        code_verifier = base64.urlsafe_b64encode(secrets.token_bytes(32)).rstrip(b'=')
         
         # Generate code challenge from code verifier
-        code_challenge = base64.urlsafe_b64encode(
-            hashlib.sha256(code_verifier.encode('utf-8')).digest()
-        ).decode('utf-8').rstrip('=')
+        code_challenge = base64.urlsafe_b64encode(hashlib.sha256(code_verifier).digest()).rstrip(b'=')
         
         return {
-            "code_verifier": code_verifier,
-            "code_challenge": code_challenge
+            "code_verifier": code_verifier.decode('ascii'),
+            "code_challenge": code_challenge.decode('ascii')
         }
     
+    def aopen(self):
+        """
+        Recreate the pooled async HTTP client if aclose() has closed it
+        """
+        if self.async_session.is_closed:
+            self.async_session = self._new_async_session()
+    
+    async def aclose(self):
+        """
+        Close the pooled async HTTP client
+        """
+        await self.async_session.aclose()
+    
     def get_authorization_url(self, code_challenge, state=None, scope=None):
         """
         Get the Fanvue authorization URL
@@ -108,7 +190,7 @@ class FanvueOAuth:
         
         headers = {'Content-Type': 'application/x-www-form-urlencoded'}
         
-        response = requests.post(self.TOKEN_URL, data=data, headers=headers)
+        response = self.session.post(self.TOKEN_URL, data=data, headers=headers)
         response.raise_for_status()
         
         return response.json()
@@ -133,7 +215,7 @@ class FanvueOAuth:
             'refresh_token': refresh_token,
         }
         
-        response = requests.post(self.TOKEN_URL, data=data)
+        response = self.session.post(self.TOKEN_URL, data=data)
         response.raise_for_status()
         
         return response.json()
@@ -148,11 +230,8 @@ class FanvueOAuth:
         Returns:
             dict: User profile data
         """
-        headers = {
-            'Authorization': f'Bearer {access_token}',
-            'X-Fanvue-API-Version': '2025-06-26'
-        }
-        response = requests.get(f"{self.API_BASE_URL}/users/me", headers=headers)
+        headers = self._api_headers(access_token)
+        response = self.session.get(f"{self.API_BASE_URL}/users/me", headers=headers)
         response.raise_for_status()
         
         return response.json()
@@ -167,11 +246,24 @@ class FanvueOAuth:
         Returns:
             dict: List of chats
         """
-        headers = {
-            'Authorization': f'Bearer {access_token}',
-            'X-Fanvue-API-Version': '2025-06-26'
-        }
-        response = requests.get(f"{self.API_BASE_URL}/chats", headers=headers)
+        headers = self._api_headers(access_token)
+        response = self.session.get(f"{self.API_BASE_URL}/chats", headers=headers)
+        response.raise_for_status()
+        
+        return response.json()
+    
+    async def aget_chats(self, access_token):
+        """
+        Async variant of get_chats
+        
+        Args:
+            access_token (str): Access token from token exchange
+            
+        Returns:
+            dict: List of chats
+        """
+        headers = self._api_headers(access_token)
+        response = await self.async_session.get(f"{self.API_BASE_URL}/chats", headers=headers)
         response.raise_for_status()
         
         return response.json()
@@ -190,16 +282,13 @@ class FanvueOAuth:
         Returns:
             dict: Paginated list of messages
         """
-        headers = {
-            'Authorization': f'Bearer {access_token}',
-            'X-Fanvue-API-Version': '2025-06-26'
-        }
+        headers = self._api_headers(access_token)
         params = {
             'page': page,
             'size': min(size, 50),
             'markAsRead': str(mark_as_read).lower()
         }
-        response = requests.get(
+        response = self.session.get(
             f"{self.API_BASE_URL}/chats/{user_uuid}/messages",
             headers=headers,
             params=params
@@ -223,22 +312,37 @@ class FanvueOAuth:
         Returns:
             dict: Response from Fanvue API
         """
-        headers = {
-            'Authorization': f'Bearer {access_token}',
-            'Content-Type': 'application/json',
-            'X-Fanvue-API-Version': '2025-06-26'
-        }
-        data = {
-            'text': text
-        }
-        if media_uuids:
-            data['mediaUuids'] = media_uuids
-        if price is not None:
-            data['price'] = price
-        if template_uuid:
-            data['templateUuid'] = template_uuid
+        headers = self._api_headers(access_token, json=True)
+        data = self._message_payload(text, media_uuids, price, template_uuid)
+        
+        response = self.session.post(
+            f"{self.API_BASE_URL}/chats/{user_uuid}/message",
+            headers=headers,
+            json=data
+        )
+        response.raise_for_status()
+        
+        return response.json()
+    
+    async def asend_message(self, access_token, user_uuid, text, media_uuids=None, price=None, template_uuid=None):
+        """
+        Async variant of send_message
+        
+        Args:
+            access_token (str): Access token from token exchange
+            user_uuid (str): UUID of the user to send message to
+            text (str): Text message content
+            media_uuids (list): Optional list of media UUIDs to attach
+            price (float): Optional price for pay-to-view content
+            template_uuid (str): Optional template UUID to use
             
-        response = requests.post(
+        Returns:
+            dict: Response from Fanvue API
+        """
+        headers = self._api_headers(access_token, json=True)
+        data = self._message_payload(text, media_uuids, price, template_uuid)
+        
+        response = await self.async_session.post(
             f"{self.API_BASE_URL}/chats/{user_uuid}/message",
             headers=headers,
             json=data
@@ -262,12 +366,9 @@ class FanvueOAuth:
             dict: Response data from Fanvue API
         """
         url = f"{self.API_BASE_URL}{endpoint}"
-        headers = {
-            'Authorization': f'Bearer {access_token}',
-            'X-Fanvue-API-Version': '2025-06-26'
-        }
+        headers = self._api_headers(access_token)
         
-        response = requests.request(
+        response = self.session.request(
             method,
             url,
             headers=headers,
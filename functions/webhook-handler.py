@@ -5,4 +5,6 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)) + '/../')
 from listener import app
 from mangum import Mangum
 
-handler = Mangum(app)
+# Mangum would run startup and shutdown on every invocation; the database pool and
+# HTTP clients are opened lazily instead and stay warm between invocations
+handler = Mangum(app, lifespan="off")
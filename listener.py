@@ -1,29 +1,28 @@
 # listener.py
 import os
+import json
+import asyncio
+from contextlib import asynccontextmanager
 import hmac
-import hashlib
 import time
-import requests
 import uvicorn
 import logging
-import yaml
 import re
-import psycopg2
-import psycopg2.extras
-from fastapi import FastAPI, Request, HTTPException, BackgroundTasks
+from uuid import uuid4
+import asyncpg
+from fastapi import FastAPI, Request, Response, HTTPException, BackgroundTasks
 from dotenv import load_dotenv
-from typing import Dict, Any
+from typing import Dict, Any, List, Tuple, Optional
+
+# Shared configuration (loaded once for brain.py and listener.py) and JSON helpers
+from config_loader import config, json_loads
 
 # Import Sarah's brain logic
-from brain import generate_sarah_response
+from brain import generate_sarah_response, open_http_client, close_http_client
 
 # Import Fanvue OAuth integration
 from fanvue import FanvueOAuth
 
-# Load configuration from config.yaml
-with open(os.path.join(os.path.dirname(__file__), "config.yaml"), "r", encoding="utf-8") as f:
-    config = yaml.safe_load(f)
-
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -34,8 +33,23 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+
 load_dotenv()
-app = FastAPI(title="Sarah-Engine", version="1.0.0")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Open the database pool and HTTP clients on startup; close pooled connections on shutdown"""
+    await open_db_pool()
+    open_http_clients()
+    # Only the long-running server checks the Fanvue connection, not every serverless invocation
+    ping_task = asyncio.create_task(ping_fanvue()) if PING_FANVUE_ON_STARTUP else None
+    yield
+    if ping_task:
+        ping_task.cancel()
+    await close_db_pool()
+    await close_http_clients()
+
+app = FastAPI(title="Sarah-Engine", version="1.0.0", lifespan=lifespan)
 
 @app.get("/")
 async def health_check():
@@ -67,8 +81,12 @@ async def ping():
         "service": "Sarah-Engine"
     }
 
+# The PKCE code verifier lives in a short-lived cookie between /auth/login and /auth/callback
+PKCE_COOKIE = "pkce_verifier"
+PKCE_COOKIE_MAX_AGE = 600  # seconds
+
 @app.get("/auth/login")
-async def login():
+async def login(response: Response):
     """
     Initiates the Fanvue OAuth flow by generating PKCE parameters and redirecting to Fanvue
     """
@@ -77,6 +95,14 @@ async def login():
         pkce = fanvue_oauth.generate_pkce_parameters()
         
         # Store code verifier in cookie (httponly and secure for production)
+        response.set_cookie(
+            PKCE_COOKIE,
+            pkce['code_verifier'],
+            max_age=PKCE_COOKIE_MAX_AGE,
+            httponly=True,
+            secure=True,
+            samesite="lax"
+        )
         auth_url = fanvue_oauth.get_authorization_url(pkce['code_challenge'])
         
         logger.info("OAuth flow initiated")
@@ -86,25 +112,24 @@ async def login():
         raise HTTPException(status_code=500, detail="Failed to initiate login")
 
 @app.get("/auth/callback")
-async def callback(code: str, state: str):
+async def callback(code: str, state: str, request: Request, response: Response):
     """
     OAuth callback endpoint to exchange authorization code for tokens
     """
+    # Code verifier generated for this login by /auth/login
+    code_verifier = request.cookies.get(PKCE_COOKIE)
+    if not code_verifier:
+        logger.warning("⚠️  OAuth callback without a PKCE code verifier cookie")
+        raise HTTPException(status_code=400, detail="Login session expired, please log in again")
+    
     try:
         logger.info(f"Received OAuth callback with code: {code[:10]}...")
         
-        # NOTE: In a real implementation, you would retrieve the code_verifier from cookies or session
-        # For this example, we're generating a new one (this won't work in production)
-        # You should implement proper session management
-        
-        logger.warning("⚠️  Code verifier not properly stored in session - this is a demo implementation")
-        
-        # This is just for demonstration - in production, you need to store and retrieve
-        # the code_verifier that was generated during the login step
-        pkce = fanvue_oauth.generate_pkce_parameters()
+        # The verifier is single-use
+        response.delete_cookie(PKCE_COOKIE, secure=True, httponly=True, samesite="lax")
         
         try:
-            tokens = fanvue_oauth.exchange_code_for_tokens(code, pkce['code_verifier'])
+            tokens = fanvue_oauth.exchange_code_for_tokens(code, code_verifier)
             logger.info("✅ OAuth token exchange successful")
             
             # Store tokens in token cache
@@ -159,19 +184,89 @@ async def refresh(refresh_token: str):
 
 # --- Configurations ---
 SIGNING_SECRET = os.getenv("FANVUE_WEBHOOK_SECRET")
+_SIGNING_SECRET_BYTES = SIGNING_SECRET.encode() if SIGNING_SECRET else None
 CLIENT_ID = os.getenv("FANVUE_CLIENT_ID")
 CLIENT_SECRET = os.getenv("FANVUE_CLIENT_SECRET")
 API_VERSION = os.getenv("FANVUE_API_VERSION", "2025-06-26")
-
-# PostgreSQL Connection Setup using psycopg2
-def get_db_connection():
-    """Get a connection to the PostgreSQL database"""
+DB_URL = os.getenv("SUPABASE_DB_URL")
+# Set by the uvicorn entry point below
+PING_FANVUE_ON_STARTUP = False
+
+# Headers sent with every Fanvue API call; only Authorization is added per request
+BASE_HEADERS = {"X-Fanvue-API-Version": API_VERSION}
+
+# PostgreSQL Connection Setup using an asyncpg connection pool
+db_pool: Optional[asyncpg.Pool] = None
+_db_pool_lock = asyncio.Lock()
+
+async def init_db_connection(conn: asyncpg.Connection):
+    """Decode json columns into Python objects, as psycopg2 did"""
+    await conn.set_type_codec("json", encoder=json.dumps, decoder=json_loads, schema="pg_catalog")
+
+async def get_db_pool() -> asyncpg.Pool:
+    """Create the process-wide connection pool on first use"""
+    global db_pool
+    async with _db_pool_lock:
+        if db_pool is None:
+            try:
+                db_pool = await asyncpg.create_pool(
+                    DB_URL,
+                    min_size=2,
+                    max_size=20,
+                    init=init_db_connection
+                )
+            except Exception as e:
+                logger.error(f"❌ Database connection failed: {str(e)}")
+                raise
+    return db_pool
+
+async def open_db_pool():
+    """Open the pool at startup so the first webhook doesn't pay for the connection handshakes"""
     try:
-        conn = psycopg2.connect(os.getenv("SUPABASE_DB_URL"))
-        return conn
-    except Exception as e:
-        logger.error(f"❌ Database connection failed: {str(e)}")
-        raise
+        await get_db_pool()
+        logger.info("✅ Database connection pool ready")
+    except Exception:
+        pass
+
+async def close_db_pool():
+    """Close every pooled database connection; the next get_db_pool() opens a fresh pool"""
+    global db_pool
+    async with _db_pool_lock:
+        if db_pool is not None:
+            await db_pool.close()
+            db_pool = None
+
+# "Fan Name: ..." line written into the lore by generate_lore_update
+_FAN_NAME_RE = re.compile(r"Fan Name: ([^\n]+)")
+
+# Rapid-fire messages from one fan are answered together once they stop arriving
+MESSAGE_BURST_WINDOW = 0.25  # seconds
+MESSAGE_BURST_MAX = 8
+pending_bursts: Dict[str, List[Tuple[str, str]]] = {}
+
+async def collect_message_burst(fan_id: str, msg_id: str, text: str) -> List[Tuple[str, str]]:
+    """
+    Buffer a message until the fan has been quiet for MESSAGE_BURST_WINDOW
+    
+    Args:
+        fan_id: Fan's unique identifier
+        msg_id: Fanvue message UUID
+        text: Message text
+        
+    Returns:
+        The buffered (msg_id, text) pairs if this call should answer the burst,
+        or an empty list if a later message will answer it instead
+    """
+    burst = pending_bursts.setdefault(fan_id, [])
+    burst.append((msg_id, text))
+    
+    if len(burst) < MESSAGE_BURST_MAX:
+        await asyncio.sleep(MESSAGE_BURST_WINDOW)
+        # Another message arrived meanwhile, or the burst was already flushed
+        if pending_bursts.get(fan_id) is not burst or burst[-1][0] != msg_id:
+            return []
+    
+    return pending_bursts.pop(fan_id)
 
 # Initialize Fanvue OAuth client
 fanvue_oauth = FanvueOAuth()
@@ -179,7 +274,7 @@ fanvue_oauth = FanvueOAuth()
 # Token Cache to prevent unnecessary auth requests
 token_cache = {"token": None, "expires_at": 0}
 
-def get_fanvue_token() -> str:
+async def get_fanvue_token() -> str:
     """Refreshes OAuth token only when expired (approx every 24h)"""
     if token_cache["token"] and time.time() < token_cache["expires_at"]:
         return token_cache["token"]
@@ -187,15 +282,14 @@ def get_fanvue_token() -> str:
     logger.info("🔑 Refreshing Fanvue OAuth Token...")
     try:
         # Use the correct token endpoint from fanvue.py
-        resp = requests.post(
-            "https://auth.fanvue.com/oauth2/token",
+        resp = await fanvue_oauth.async_session.post(
+            FanvueOAuth.TOKEN_URL,
             data={
                 "grant_type": "client_credentials",
                 "client_id": CLIENT_ID,
                 "client_secret": CLIENT_SECRET,
                 "scope": "read:chat write:chat"
-            },
-            timeout=30
+            }
         )
         resp.raise_for_status()
         data = resp.json()
@@ -207,21 +301,34 @@ def get_fanvue_token() -> str:
         logger.error(f"❌ Failed to refresh OAuth token: {str(e)}")
         raise
 
-def verify_signature(payload: str, signature_header: str) -> bool:
+def verify_signature(payload: bytes, signature_header: str) -> bool:
     """Verifies Svix-style signatures from Fanvue"""
+    if not _SIGNING_SECRET_BYTES:
+        # An empty HMAC key would let anyone sign a webhook
+        logger.error("❌ Signature verification failed: FANVUE_WEBHOOK_SECRET is not set")
+        return False
+    
     try:
         # Expected format: t=123,v0=abc
-        parts = dict(x.split('=') for x in signature_header.split(','))
-        timestamp, received_sig = parts.get('t'), parts.get('v0')
+        if signature_header.count(',') > 1:
+            # Extra key/value pairs (e.g. a v1 signature): fall back to a full parse
+            parts = dict(x.partition('=')[::2] for x in signature_header.split(','))
+            timestamp, received_sig = parts.get('t'), parts.get('v0')
+        else:
+            ts_kv, _, v_kv = signature_header.partition(',')
+            if ts_kv.startswith('v0='):
+                ts_kv, v_kv = v_kv, ts_kv
+            timestamp = ts_kv[2:] if ts_kv.startswith('t=') else None
+            received_sig = v_kv[3:] if v_kv.startswith('v0=') else None
         
         if not timestamp or not received_sig or abs(time.time() - int(timestamp)) > 300:
             logger.warning("❌ Signature verification failed: Invalid timestamp or signature")
             return False
 
-        to_sign = f"{timestamp}.{payload}".encode()
-        expected_sig = hmac.new(SIGNING_SECRET.encode(), to_sign, hashlib.sha256).hexdigest()
+        to_sign = b"".join((timestamp.encode(), b".", payload))
+        expected_sig = hmac.digest(_SIGNING_SECRET_BYTES, to_sign, 'sha256')
         
-        if not hmac.compare_digest(expected_sig, received_sig):
+        if not hmac.compare_digest(expected_sig, bytes.fromhex(received_sig)):
             logger.warning("❌ Signature verification failed: Mismatch")
             return False
             
@@ -244,11 +351,16 @@ async def update_fan_lore(fan_id: str, incoming_text: str, fan_name: str, previo
     Returns:
         Updated fan lore string
     """
+    # Nothing to learn from an empty message or one the lore already contains word for word
+    stripped = incoming_text.strip()
+    if not stripped or re.search(rf"(?<!\w){re.escape(stripped)}(?!\w)", previous_lore, re.IGNORECASE):
+        return previous_lore.strip()
+    
     # Import the AI lore generation function
     from brain import generate_lore_update
     
     # Use AI to analyze the message for new lore
-    new_info = generate_lore_update(incoming_text, previous_lore)
+    new_info = await generate_lore_update(incoming_text, previous_lore)
     
     if new_info == "NO_NEW_INFO":
         return previous_lore.strip()
@@ -261,6 +373,52 @@ async def update_fan_lore(fan_id: str, incoming_text: str, fan_name: str, previo
     
     return updated_lore.strip()
 
+async def deliver_reply(fan_id: str, reply_text: str) -> bool:
+    """
+    Send Sarah's reply to the fan on Fanvue
+    
+    Args:
+        fan_id: Fan's unique identifier
+        reply_text: Reply to send
+        
+    Returns:
+        True if Fanvue accepted the message, False otherwise
+    """
+    try:
+        token = await get_fanvue_token()
+        await fanvue_oauth.asend_message(token, fan_id, reply_text)
+        logger.info("✅ Response sent to Fanvue successfully")
+        return True
+    except Exception as e:
+        logger.error(f"❌ Failed to reply: {str(e)}")
+        return False
+
+async def save_reply(fan_id: str, assistant_msg_id: str, reply_text: str,
+                     updated_lore: Optional[str] = None, new_name: Optional[str] = None) -> None:
+    """
+    Save Sarah's reply and any lore changes in one short transaction
+    
+    Args:
+        fan_id: Fan's unique identifier
+        assistant_msg_id: ID for the assistant message
+        reply_text: Reply sent to the fan
+        updated_lore: New lore text, or None if unchanged
+        new_name: New fan name, or None if unchanged
+    """
+    pool = await get_db_pool()
+    async with pool.acquire() as conn:
+        async with conn.transaction():
+            if updated_lore is not None or new_name:
+                await conn.execute("""
+                    UPDATE fan_lore 
+                    SET lore_text = COALESCE($1, lore_text), name = COALESCE($2, name) 
+                    WHERE fan_id = $3
+                """, updated_lore, new_name, fan_id)
+            await conn.execute("""
+                INSERT INTO messages (id, fan_id, role, content)
+                VALUES ($1, $2, $3, $4)
+            """, assistant_msg_id, fan_id, "assistant", reply_text)
+
 async def process_message(data: Dict[str, Any]):
     """Process incoming message from Fanvue"""
     try:
@@ -277,129 +435,131 @@ async def process_message(data: Dict[str, Any]):
 
         logger.info(f"Processing message from fan {fan_id}: {incoming_text[:50]}...")
 
-        # Get database connection
-        conn = get_db_connection()
-        cur = conn.cursor(cursor_factory=psycopg2.extras.DictCursor)
-
-        # 1. Ensure fan_lore record exists first (to satisfy foreign key constraint)
-        cur.execute("SELECT * FROM fan_lore WHERE fan_id = %s", (fan_id,))
-        lore = cur.fetchone()
-        
-        if not lore:
-            # Create new fan lore record if not exists
-            logger.info(f"Creating new fan lore record for fan {fan_id}")
-            cur.execute("""
+        # Answer a quick succession of messages with one reply
+        burst = await collect_message_burst(fan_id, msg_id, incoming_text)
+        if not burst:
+            logger.info(f"Message {msg_id} will be answered with the rest of the burst from fan {fan_id}")
+            return
+        if len(burst) > 1:
+            incoming_text = "\n".join(text for _, text in burst)
+            logger.info(f"Answering {len(burst)} messages from fan {fan_id} together")
+
+        # Get database connection pool
+        pool = await get_db_pool()
+
+        # 1-3. In one round-trip: ensure the fan_lore record exists (to satisfy the
+        # foreign key constraint), save the new message(s) (User) and pull the
+        # history. The history subquery sees the table as it was before this
+        # statement, so the messages it actually inserted are returned separately.
+        # The statement commits on its own, so no connection or row lock is held
+        # while the replies are generated.
+        # asyncpg prepares each statement on first use and reuses the plan per connection
+        lore_name, previous_lore, history, inserted = await pool.fetchrow("""
+            WITH upserted AS (
                 INSERT INTO fan_lore (fan_id, name, lore_text, last_vibe)
-                VALUES (%s, %s, %s, %s)
-            """, (fan_id, "Unknown", "", "Friendly"))
-            conn.commit()
-            cur.execute("SELECT * FROM fan_lore WHERE fan_id = %s", (fan_id,))
-            lore = cur.fetchone()
-
-        # 2. Save the new message to PostgreSQL immediately (User)
-        cur.execute("""
-            INSERT INTO messages (id, fan_id, role, content)
-            VALUES (%s, %s, %s, %s)
-            ON CONFLICT (id) DO NOTHING
-        """, (msg_id, fan_id, "user", incoming_text))
-        conn.commit()
+                VALUES ($1, 'Unknown', '', 'Friendly')
+                ON CONFLICT (fan_id) DO UPDATE SET fan_id = EXCLUDED.fan_id
+                RETURNING fan_id, name, lore_text
+            ), new_msgs AS (
+                -- now() is the same for the whole burst; the ordinal keeps its messages in order
+                INSERT INTO messages (id, fan_id, role, content, created_at)
+                SELECT m.id, u.fan_id, 'user', m.content, now() + m.ord * interval '1 microsecond'
+                FROM upserted u, unnest($2::text[], $3::text[]) WITH ORDINALITY AS m(id, content, ord)
+                ON CONFLICT (id) DO NOTHING
+                RETURNING id
+            )
+            SELECT
+                u.name,
+                u.lore_text,
+                (SELECT json_agg(h ORDER BY h.created_at) FROM (
+                    SELECT role, content, created_at FROM messages 
+                    WHERE fan_id = $1 
+                    ORDER BY created_at DESC LIMIT 6
+                ) h) AS history,
+                (SELECT array_agg(id) FROM new_msgs) AS inserted
+            FROM upserted u
+        """, fan_id, [m for m, _ in burst], [t for _, t in burst])
+        inserted = set(inserted or ())
         logger.info("✅ User message saved to database")
-
-        # 3. Pull History (Last 5 messages)
-        
-        # Get chat history
-        cur.execute("""
-            SELECT role, content FROM messages 
-            WHERE fan_id = %s 
-            ORDER BY created_at DESC LIMIT 6
-        """, (fan_id,))
-        history = cur.fetchall()
         
-        # Reverse history to get chronological order for Aion-2.0
-        chat_history = [{"role": row["role"], "content": row["content"]} for row in reversed(history)]
+        # Chronological order for Aion-2.0, with this burst as the latest messages
+        chat_history = [{"role": h["role"], "content": h["content"]} for h in history or ()]
+        chat_history.extend({"role": "user", "content": text} for m, text in burst if m in inserted)
+        chat_history = chat_history[-6:]
         logger.info(f"✅ Retrieved fan lore and {len(chat_history)} messages")
 
         # 3. Extract and update fan lore from incoming message
-        fan_name = ""
-        if lore and "Fan Name:" in lore.get('lore_text', ""):
-            fan_name = re.search(r"Fan Name: ([^\n]+)", lore.get('lore_text', "")).group(1)
+        previous_lore = previous_lore or ""
+        name_match = _FAN_NAME_RE.search(previous_lore)
+        fan_name = name_match.group(1) if name_match else ""
         
-        updated_lore = await update_fan_lore(fan_id, incoming_text, fan_name, lore.get('lore_text', ""))
-        
-        if updated_lore != lore.get('lore_text', ""):
-            cur.execute("""
-                UPDATE fan_lore 
-                SET lore_text = %s 
-                WHERE fan_id = %s
-            """, (updated_lore, fan_id))
-            conn.commit()
-            logger.info("✅ Fan lore updated")
+        updated_lore = await update_fan_lore(fan_id, incoming_text, fan_name, previous_lore)
+        lore_changed = updated_lore != previous_lore
         
         # Extract and update fan name in separate column if available
-        name_match = re.search(r"Fan Name: ([^\n]+)", updated_lore)
+        new_name = None
+        if lore_changed:
+            name_match = _FAN_NAME_RE.search(updated_lore)
         if name_match:
             extracted_name = name_match.group(1).strip()
-            if extracted_name and extracted_name != "Unknown" and extracted_name != lore.get('name', ""):
-                cur.execute("""
-                    UPDATE fan_lore 
-                    SET name = %s 
-                    WHERE fan_id = %s
-                """, (extracted_name, fan_id))
-                conn.commit()
-                logger.info(f"✅ Fan name updated to: {extracted_name}")
+            if extracted_name and extracted_name != "Unknown" and extracted_name != lore_name:
+                new_name = extracted_name
 
         # 4. Generate response with Aion-2.0
-        reply_text = generate_sarah_response(
+        reply_text = await generate_sarah_response(
             incoming_text, 
             fan_lore=updated_lore,
-            chat_history=chat_history
+            chat_history=chat_history,
+            fan_id=fan_id
         )
         logger.info(f"✅ Generated response: {reply_text[:50]}...")
 
-        # 5. Save Sarah's response (Assistant)
+        # 5. Save Sarah's response (Assistant) and send it to Fanvue at the same time
         # Generate a unique ID for the assistant message
-        import uuid
-        assistant_msg_id = str(uuid.uuid4())
-        cur.execute("""
-            INSERT INTO messages (id, fan_id, role, content)
-            VALUES (%s, %s, %s, %s)
-        """, (assistant_msg_id, fan_id, "assistant", reply_text))
-        conn.commit()
+        assistant_msg_id = uuid4().hex
+        _, delivered = await asyncio.gather(
+            save_reply(
+                fan_id,
+                assistant_msg_id,
+                reply_text,
+                updated_lore=updated_lore if lore_changed else None,
+                new_name=new_name
+            ),
+            deliver_reply(fan_id, reply_text)
+        )
         logger.info("✅ Assistant response saved to database")
-
-        # 5. Send to Fanvue
-        token = get_fanvue_token()
-        try:
-            fanvue_oauth.send_message(token, fan_id, reply_text)
-            logger.info("✅ Response sent to Fanvue successfully")
-        except Exception as e:
-            logger.error(f"❌ Failed to reply: {str(e)}")
+        if lore_changed:
+            logger.info("✅ Fan lore updated")
+        if new_name:
+            logger.info(f"✅ Fan name updated to: {new_name}")
+        if not delivered:
+            # Left for a retry job to pick up
+            await pool.execute("UPDATE messages SET delivered = false WHERE id = $1", assistant_msg_id)
             
     except Exception as e:
         logger.error(f"❌ Error processing message: {str(e)}")
-        if 'conn' in locals():
-            try:
-                conn.rollback()
-            except:
-                pass
-    finally:
-        if 'conn' in locals() and conn:
-            try:
-                conn.close()
-            except:
-                pass
+
+def open_http_clients():
+    """(Re)open the pooled HTTP clients used for Fanvue and OpenRouter"""
+    fanvue_oauth.aopen()
+    open_http_client()
+
+async def close_http_clients():
+    """Close the pooled HTTP clients used for Fanvue and OpenRouter"""
+    await fanvue_oauth.aclose()
+    await close_http_client()
 
 @app.post("/webhooks/fanvue")
 async def fanvue_webhook(request: Request, background_tasks: BackgroundTasks):
     """Fanvue webhook endpoint for incoming messages"""
     signature = request.headers.get("X-Fanvue-Signature")
     body = await request.body()
-    payload_str = body.decode()
 
-    if not signature or not verify_signature(payload_str, signature):
+    if not signature or not verify_signature(body, signature):
         raise HTTPException(status_code=401, detail="Signature mismatch")
 
-    event_data = await request.json()
+    # Parse the bytes already read instead of letting request.json() decode them again
+    event_data = json_loads(body)
     
     logger.info(f"Received webhook event: {event_data}")
     
@@ -413,17 +573,13 @@ async def fanvue_webhook(request: Request, background_tasks: BackgroundTasks):
 async def ping_fanvue():
     """Ping Fanvue API to check connection and confirm creator account"""
     try:
-        token = get_fanvue_token()
-        headers = {
-            "Authorization": f"Bearer {token}",
-            "X-Fanvue-API-Version": API_VERSION
-        }
+        token = await get_fanvue_token()
+        headers = {**BASE_HEADERS, "Authorization": f"Bearer {token}"}
         
         # Try to get user profile to confirm connection
-        response = requests.get(
-            "https://api.fanvue.com/users/me",
-            headers=headers,
-            timeout=30
+        response = await fanvue_oauth.async_session.get(
+            f"{FanvueOAuth.API_BASE_URL}/users/me",
+            headers=headers
         )
         
         if response.status_code == 200:
@@ -442,10 +598,5 @@ if __name__ == "__main__":
     logger.info(f"Persona: {persona.get('name', 'Sarah')}, {persona.get('age', 24)} from {persona.get('city', 'Miami')}")
     logger.info(f"Hobbies: {', '.join(hobbies)}")
     
-    # Ping Fanvue on startup
-    import threading
-    ping_thread = threading.Thread(target=ping_fanvue)
-    ping_thread.daemon = True
-    ping_thread.start()
-    
+    PING_FANVUE_ON_STARTUP = True
     uvicorn.run(app, host="0.0.0.0", port=8000)
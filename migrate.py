@@ -1,10 +1,10 @@
 import os
-import urllib.parse
 import logging
 from dotenv import load_dotenv
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, text
 from sqlalchemy.engine import make_url
-from models import Base
+from sqlalchemy.pool import NullPool
+from models import Base, Message
 
 # Configure logging
 logging.basicConfig(
@@ -22,7 +22,7 @@ def run_migrations():
     """
     Run database migrations to create tables based on SQLAlchemy models.
     
-    Handles connection string parsing and password encoding for special characters.
+    Handles connection string parsing; SQLAlchemy escapes special characters in the password.
     """
     try:
         raw_url = os.getenv("SUPABASE_DB_URL")
@@ -37,17 +37,34 @@ def run_migrations():
         # Strip the brackets if they are literally in the string
         clean_password = url.password.strip('[]')
         
-        # Reconstruct with encoded password
-        encoded_password = urllib.parse.quote_plus(clean_password)
-        
-        # Build the final safe URL
-        safe_url = f"postgresql://{url.username}:{encoded_password}@{url.host}:{url.port}/{url.database}"
+        # Pin the driver we ship (psycopg2-binary; also normalizes postgres://) and swap in the clean password
+        safe_url = url.set(drivername="postgresql+psycopg2", password=clean_password)
         
         logger.info(f"🔗 Connecting to Supabase at {url.host}:{url.port}")
-        engine = create_engine(safe_url)
+        # One short-lived process: no pool to keep, and fail fast instead of hanging on the network
+        engine = create_engine(
+            safe_url,
+            poolclass=NullPool,
+            connect_args={
+                "connect_timeout": 10,
+                "sslmode": "require",
+                "application_name": "nexus-migrate"
+            }
+        )
         
         try:
             Base.metadata.create_all(engine)
+            
+            # create_all skips tables that already exist, so add new indexes explicitly
+            with engine.begin() as conn:
+                for index in Message.__table__.indexes:
+                    index.create(conn, checkfirst=True)
+                # Superseded by ix_messages_fan_created, which has fan_id as its prefix
+                conn.execute(text("DROP INDEX IF EXISTS ix_messages_fan_id"))
+                # create_all doesn't add columns to existing tables either
+                conn.execute(text(
+                    "ALTER TABLE messages ADD COLUMN IF NOT EXISTS delivered BOOLEAN NOT NULL DEFAULT true"
+                ))
             logger.info("✅ Schema is up to date!")
         except Exception as e:
             logger.error(f"❌ Migration failed: {e}")
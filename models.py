@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, ForeignKey, Text, Boolean, JSON
+from sqlalchemy import Column, String, DateTime, ForeignKey, Text, Boolean, JSON, Index, true
 from sqlalchemy.orm import declarative_base, relationship
 from sqlalchemy.sql import func
 from typing import List, Optional
@@ -46,7 +46,7 @@ class Message(Base):
     __tablename__ = "messages"
     
     id = Column(String, primary_key=True, index=True)  # Message UUID from Fanvue
-    fan_id = Column(String, ForeignKey("fan_lore.fan_id"), index=True)
+    fan_id = Column(String, ForeignKey("fan_lore.fan_id"))  # Indexed by ix_messages_fan_created
     topic = Column(Text)
     role = Column(String, nullable=False)              # "user" or "assistant"
     extension = Column(Text)
@@ -55,10 +55,16 @@ class Message(Base):
     payload = Column(JSON)
     event = Column(Text)
     private = Column(Boolean, default=False)
+    delivered = Column(Boolean, nullable=False, server_default=true())  # False if sending to Fanvue failed
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
     inserted_at = Column(DateTime, server_default=func.now())
     
     fan = relationship("FanLore", back_populates="messages")
     
+    # Serves the per-fan "latest N messages" history lookup straight from the index
+    __table_args__ = (
+        Index("ix_messages_fan_created", fan_id, created_at.desc()),
+    )
+    
     def __repr__(self):
         return f"<Message(id={self.id}, fan_id={self.fan_id}, role={self.role})>"
@@ -0,0 +1,104 @@
+import json
+import os
+import sys
+import types
+
+import pytest
+
+from config_loader import load_config
+from tools.compile_config import compile_config
+
+YAML = "persona:\n  name: Sarah\nhobbies:\n  - surfing\n"
+PARSED = {"persona": {"name": "Sarah"}, "hobbies": ["surfing"]}
+
+
+@pytest.fixture
+def yaml_path(tmp_path, monkeypatch):
+    # No compiled module, so load_config goes straight to the JSON cache and YAML
+    monkeypatch.setitem(sys.modules, "config_compiled", None)
+    path = tmp_path / "config.yaml"
+    path.write_text(YAML)
+    return str(path)
+
+
+def set_mtime(path: str, mtime: float) -> None:
+    os.utime(path, (mtime, mtime))
+
+
+def test_load_config_parses_yaml_and_writes_json_cache(yaml_path):
+    assert load_config(yaml_path) == PARSED
+    with open(yaml_path + ".json") as f:
+        assert json.load(f) == PARSED
+
+
+def test_load_config_prefers_fresh_json_cache(yaml_path):
+    with open(yaml_path + ".json", "w") as f:
+        json.dump({"from": "cache"}, f)
+    set_mtime(yaml_path, 1000)
+    set_mtime(yaml_path + ".json", 2000)
+
+    assert load_config(yaml_path) == {"from": "cache"}
+
+
+def test_load_config_reparses_after_yaml_edit(yaml_path):
+    with open(yaml_path + ".json", "w") as f:
+        json.dump({"from": "cache"}, f)
+    set_mtime(yaml_path + ".json", 1000)
+    set_mtime(yaml_path, 2000)
+
+    assert load_config(yaml_path) == PARSED
+    # The stale cache is rewritten
+    with open(yaml_path + ".json") as f:
+        assert json.load(f) == PARSED
+
+
+def test_load_config_ignores_corrupt_json_cache(yaml_path):
+    with open(yaml_path + ".json", "w") as f:
+        f.write('{"persona": ')
+    set_mtime(yaml_path, 1000)
+
+    assert load_config(yaml_path) == PARSED
+
+
+def test_load_config_without_writable_cache(yaml_path):
+    os.mkdir(yaml_path + ".json")
+
+    assert load_config(yaml_path) == PARSED
+
+
+def test_load_config_keeps_values_json_cannot_hold(yaml_path):
+    with open(yaml_path, "a") as f:
+        f.write("launched: 2024-05-01\n")
+
+    first = load_config(yaml_path)
+    assert str(first["launched"]) == "2024-05-01"
+    # The half-written cache is unreadable, so the next load parses the YAML again
+    assert load_config(yaml_path) == first
+
+
+@pytest.fixture
+def compiled(yaml_path, tmp_path, monkeypatch):
+    """Compile the test config.yaml into an importable config_compiled module"""
+    compile_config(yaml_path, str(tmp_path / "config_compiled.py"))
+    monkeypatch.delitem(sys.modules, "config_compiled")
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+
+def test_load_config_uses_compiled_module(compiled, yaml_path):
+    assert load_config(yaml_path) == PARSED
+    # Neither the YAML nor the JSON cache was needed
+    assert not os.path.exists(yaml_path + ".json")
+
+
+def test_load_config_skips_stale_compiled_module(compiled, yaml_path, caplog):
+    with open(yaml_path, "a") as f:
+        f.write("extra: true\n")
+
+    assert load_config(yaml_path) == {**PARSED, "extra": True}
+    assert "config_compiled.py is stale" in caplog.text
+
+
+def test_load_config_skips_module_without_source_hash(yaml_path, monkeypatch):
+    monkeypatch.setitem(sys.modules, "config_compiled", types.ModuleType("config_compiled"))
+
+    assert load_config(yaml_path) == PARSED
@@ -0,0 +1,197 @@
+import asyncio
+import hashlib
+import hmac
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+import listener
+
+SECRET = b"test-webhook-secret"
+BODY = b'{"message": {"text": "h\xc3\xa9 there"}, "sender": {"uuid": "fan-1"}}'
+
+
+def sign(body: bytes, timestamp: str, key: bytes = SECRET) -> str:
+    return hmac.new(key, timestamp.encode() + b"." + body, hashlib.sha256).hexdigest()
+
+
+@pytest.fixture
+def secret(monkeypatch):
+    monkeypatch.setattr(listener, "_SIGNING_SECRET_BYTES", SECRET)
+
+
+@pytest.fixture
+def timestamp():
+    return str(int(time.time()))
+
+
+@pytest.mark.parametrize("header", [
+    "t={ts},v0={sig}",
+    "v0={sig},t={ts}",
+    "t={ts},v0={sig},v1=deadbeef",
+    "v1=deadbeef,v0={sig},t={ts}",
+])
+def test_verify_signature_accepts_valid_headers(secret, timestamp, header):
+    header = header.format(ts=timestamp, sig=sign(BODY, timestamp))
+    assert listener.verify_signature(BODY, header)
+
+
+@pytest.mark.parametrize("header", [
+    "t={ts},v1={sig}",
+    "t={ts}",
+    "v0={sig}",
+    "garbage",
+    "",
+])
+def test_verify_signature_rejects_malformed_headers(secret, timestamp, header):
+    header = header.format(ts=timestamp, sig=sign(BODY, timestamp))
+    assert not listener.verify_signature(BODY, header)
+
+
+@pytest.mark.parametrize("header", [
+    "t={ts},v0=not-hex",
+    "t={ts},v0={sig}00",
+    "t={ts},v0={sig_bad}",
+])
+def test_verify_signature_rejects_non_matching_digests(secret, timestamp, header):
+    sig = sign(BODY, timestamp)
+    assert not listener.verify_signature(BODY, header.format(ts=timestamp, sig=sig, sig_bad=sig[:-1] + "g"))
+
+
+def test_verify_signature_rejects_tampered_body(secret, timestamp):
+    header = f"t={timestamp},v0={sign(BODY, timestamp)}"
+    assert not listener.verify_signature(BODY + b" ", header)
+
+
+def test_verify_signature_rejects_stale_timestamp(secret):
+    stale = str(int(time.time()) - 301)
+    assert not listener.verify_signature(BODY, f"t={stale},v0={sign(BODY, stale)}")
+
+
+def test_verify_signature_fails_closed_without_secret(monkeypatch, timestamp):
+    monkeypatch.setattr(listener, "_SIGNING_SECRET_BYTES", None)
+    header = f"t={timestamp},v0={sign(BODY, timestamp, key=b'')}"
+    assert not listener.verify_signature(BODY, header)
+
+
+def test_webhook_endpoint_checks_signature(secret, timestamp, monkeypatch):
+    processed = []
+
+    async def fake_process_message(data):
+        processed.append(data)
+
+    monkeypatch.setattr(listener, "process_message", fake_process_message)
+    client = TestClient(listener.app)
+
+    response = client.post(
+        "/webhooks/fanvue",
+        content=BODY,
+        headers={"X-Fanvue-Signature": f"t={timestamp},v0={sign(BODY, timestamp)}"}
+    )
+    assert response.status_code == 200
+    assert processed == [{"message": {"text": "hé there"}, "sender": {"uuid": "fan-1"}}]
+
+    response = client.post("/webhooks/fanvue", content=BODY, headers={"X-Fanvue-Signature": "t=1,v0=00"})
+    assert response.status_code == 401
+
+
+@pytest.mark.parametrize("text, skipped", [
+    ("", True),
+    ("   ", True),
+    ("loves FOOTBALL", True),
+    ("i'm 25!", True),
+    ("Al", False),
+    ("cat", False),
+])
+async def test_update_fan_lore_skips_only_whole_word_repeats(monkeypatch, text, skipped):
+    import brain
+    analyzed = []
+
+    async def fake_generate_lore_update(incoming_text, previous_lore):
+        analyzed.append(incoming_text)
+        return "NO_NEW_INFO"
+
+    monkeypatch.setattr(brain, "generate_lore_update", fake_generate_lore_update)
+    lore = "Fan Name: Bob\nLoves football and education. I'm 25!"
+
+    assert await listener.update_fan_lore("fan-1", text, "Bob", lore) == lore
+    assert analyzed == ([] if skipped else [text])
+
+
+@pytest.fixture
+def fast_bursts(monkeypatch):
+    monkeypatch.setattr(listener, "MESSAGE_BURST_WINDOW", 0.05)
+    monkeypatch.setattr(listener, "pending_bursts", {})
+
+
+async def test_collect_message_burst_single_message(fast_bursts):
+    assert await listener.collect_message_burst("fan-1", "m1", "hi") == [("m1", "hi")]
+    assert listener.pending_bursts == {}
+
+
+async def test_collect_message_burst_answers_with_last_message(fast_bursts):
+    async def send(msg_id, text, delay):
+        await asyncio.sleep(delay)
+        return await listener.collect_message_burst("fan-1", msg_id, text)
+
+    results = await asyncio.gather(send("m1", "hey", 0), send("m2", "you there?", 0.002), send("m3", "hello?", 0.004))
+
+    assert results == [[], [], [("m1", "hey"), ("m2", "you there?"), ("m3", "hello?")]]
+    assert listener.pending_bursts == {}
+
+
+async def test_collect_message_burst_keeps_fans_apart(fast_bursts):
+    results = await asyncio.gather(
+        listener.collect_message_burst("fan-1", "m1", "hi"),
+        listener.collect_message_burst("fan-2", "m2", "yo")
+    )
+    assert results == [[("m1", "hi")], [("m2", "yo")]]
+
+
+async def test_collect_message_burst_flushes_at_max(fast_bursts, monkeypatch):
+    monkeypatch.setattr(listener, "MESSAGE_BURST_MAX", 2)
+    first = asyncio.create_task(listener.collect_message_burst("fan-1", "m1", "a"))
+    await asyncio.sleep(0)
+
+    # The second message fills the burst and answers it without waiting
+    assert await listener.collect_message_burst("fan-1", "m2", "b") == [("m1", "a"), ("m2", "b")]
+    assert await first == []
+
+
+def test_pkce_verifier_round_trip(monkeypatch):
+    oauth = listener.fanvue_oauth
+    monkeypatch.setattr(oauth, "initialized", True)
+    monkeypatch.setattr(oauth, "client_id", "client")
+    monkeypatch.setattr(oauth, "redirect_uri", "https://example.com/auth/callback")
+    exchanged = []
+
+    def fake_exchange(code, code_verifier):
+        exchanged.append(code_verifier)
+        return {"access_token": "access", "expires_in": 3600}
+
+    monkeypatch.setattr(oauth, "exchange_code_for_tokens", fake_exchange)
+    monkeypatch.setattr(oauth, "get_user_profile", lambda token: {"handle": "sarah"})
+    monkeypatch.setattr(listener, "token_cache", {"token": None, "expires_at": 0})
+    client = TestClient(listener.app, base_url="https://testserver")
+
+    login = client.get("/auth/login")
+    assert login.status_code == 200
+    verifier = client.cookies.get(listener.PKCE_COOKIE)
+    assert verifier
+    set_cookie = login.headers["set-cookie"].lower()
+    assert "httponly" in set_cookie and "secure" in set_cookie
+
+    callback = client.get("/auth/callback", params={"code": "authorization-code", "state": "s"})
+    assert callback.status_code == 200
+    assert exchanged == [verifier]
+    # The verifier is single-use
+    assert client.cookies.get(listener.PKCE_COOKIE) is None
+
+
+def test_pkce_callback_without_cookie(monkeypatch):
+    monkeypatch.setattr(listener.fanvue_oauth, "exchange_code_for_tokens", pytest.fail)
+    client = TestClient(listener.app, base_url="https://testserver")
+
+    response = client.get("/auth/callback", params={"code": "authorization-code", "state": "s"})
+    assert response.status_code == 400
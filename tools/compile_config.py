@@ -0,0 +1,40 @@
+"""
+Compile config.yaml into config_compiled.py
+
+The listener imports the generated module instead of parsing YAML at startup,
+and Python caches it as bytecode like any other module. Run this as a build step
+(or after editing config.yaml):
+
+    python tools/compile_config.py
+"""
+import os
+import sys
+import hashlib
+import pprint
+import yaml
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def compile_config(yaml_path: str, output_path: str) -> None:
+    """
+    Write the parsed YAML as a Python literal
+    
+    Args:
+        yaml_path: Path to config.yaml
+        output_path: Path of the module to write
+    """
+    with open(yaml_path, "rb") as f:
+        raw = f.read()
+    config = yaml.safe_load(raw)
+    
+    with open(output_path, "w", encoding="utf-8") as f:
+        f.write(f"# Generated by tools/compile_config.py from {os.path.basename(yaml_path)}; do not edit\n")
+        # Lets the listener detect a module left over from an older config.yaml
+        f.write(f"SOURCE_SHA256 = {hashlib.sha256(raw).hexdigest()!r}\n\n")
+        f.write(f"config = {pprint.pformat(config, sort_dicts=False)}\n")
+
+if __name__ == "__main__":
+    yaml_path = sys.argv[1] if len(sys.argv) > 1 else os.path.join(ROOT, "config.yaml")
+    output_path = sys.argv[2] if len(sys.argv) > 2 else os.path.join(ROOT, "config_compiled.py")
+    compile_config(yaml_path, output_path)
+    print(f"✅ Wrote {output_path}")